@@ -1,20 +1,25 @@
 import asyncio
-import json
+import csv
 import logging
 import os
-import shutil
 from typing import Union
 
 from keboola.component.base import ComponentBase, sync_action
 from keboola.component.dao import TableDefinition
 from keboola.component.exceptions import UserException
 from keboola.component.sync_actions import SelectElement
-from keboola.csvwriter import ElasticDictWriter
 
 from configuration import Configuration, ConfigurationBase, SyncActionConfiguration
 from sap_client.client import SAPClient, SapClientException
 from sap_client.sap_snowflake_mapping import SAP_TO_SNOWFLAKE_MAP
 
+try:
+    import uvloop
+
+    uvloop.install()
+except ImportError:  # uvloop is linux-only; fall back to the default loop elsewhere
+    pass
+
 
 class Component(ComponentBase):
     def __init__(self):
@@ -46,8 +51,11 @@ class Component(ComponentBase):
         load_type = self._configuration.destination.load_type
         debug = self._configuration.debug
 
-        temp_dir = os.path.join(self.data_folder_path, "temp")
-        os.makedirs(temp_dir, exist_ok=True)
+        # pages are streamed to the CSV writer in memory; the on-disk spool is kept only for debugging
+        temp_dir = ""
+        if debug:
+            temp_dir = os.path.join(self.data_folder_path, "temp")
+            os.makedirs(temp_dir, exist_ok=True)
 
         statefile_columns = self.state.get(resource_alias, {}).get("columns", [])
 
@@ -73,7 +81,9 @@ class Component(ComponentBase):
         out_table = self.create_out_table_definition(name=output_table_name, incremental=incremental)
 
         try:
-            asyncio.run(client.fetch(resource_alias, paging_method))
+            rows_written, fieldnames = asyncio.run(
+                self._fetch_to_csv(client, resource_alias, paging_method, out_table.full_path, statefile_columns)
+            )
         except SapClientException as e:
             error_msg = str(e)
             if "TYPE_NOT_FOUND" in error_msg:
@@ -84,27 +94,15 @@ class Component(ComponentBase):
             else:
                 raise UserException(f"An error occurred while fetching resource: {e}")
 
-        files = os.listdir(temp_dir)
-
-        if files:
-            with ElasticDictWriter(out_table.full_path, statefile_columns) as wr:
-                wr.writeheader()
-                for json_file in files:
-                    json_file_path = os.path.join(temp_dir, json_file)
-                    with open(json_file_path, "r") as file:
-                        content = json.load(file)
-                        for row in content:
-                            wr.writerow(self._ensure_proper_column_names(row))
-
+        if rows_written:
             out_table = self.add_column_metadata(client, out_table)
             self.write_manifest(out_table)
 
-            self.state.setdefault(resource_alias, {})["columns"] = wr.fieldnames
-
-            # Clean temp folder (for local runs)
-            shutil.rmtree(temp_dir)
+            self.state.setdefault(resource_alias, {})["columns"] = fieldnames
         else:
             logging.warning(f"No data were fetched for resource {resource_alias}.")
+            if os.path.exists(out_table.full_path):
+                os.remove(out_table.full_path)
 
         max_delta_pointer = client.max_delta_pointer
         if max_delta_pointer:
@@ -113,6 +111,92 @@ class Component(ComponentBase):
 
         self.write_state_file(self.state)
 
+    async def _fetch_to_csv(
+        self,
+        client: SAPClient,
+        resource_alias: str,
+        paging_method: str,
+        output_path: str,
+        statefile_columns: list[str],
+    ) -> tuple[int, list[str]]:
+        """Runs the client fetch and the CSV writer concurrently, passing pages through an in-memory queue.
+
+        Pages arrive as (columns, rows) tuples with rows in SAP's positional
+        form, so they are written through csv.writer without building a dict
+        per row. Returns the number of rows written and the final header."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=client.batch_size * 2)
+
+        rows_written = 0
+        fieldnames: list[str] = []
+
+        async def produce():
+            await client.fetch(resource_alias, paging_method, queue=queue)
+            # sentinel only on success; on failure the TaskGroup cancels the consumer,
+            # and putting it from a finally could block forever on a full queue
+            await queue.put(None)
+
+        async def consume():
+            nonlocal rows_written, fieldnames
+            with open(output_path, "w", buffering=1 << 20, newline="", encoding="utf-8") as out:
+                writer = csv.writer(out)
+                project = None
+                page_columns = None
+                while (page := await queue.get()) is not None:
+                    columns, rows = page
+                    if columns != page_columns:
+                        page_columns = columns
+                        if not fieldnames:
+                            fieldnames = self._merge_fieldnames(statefile_columns, columns)
+                            writer.writerow(fieldnames)
+                        project = self._build_row_projector(columns, fieldnames)
+                    # encode in a worker thread so the event loop keeps fetching the next pages
+                    await asyncio.to_thread(self._write_page, writer, rows, project)
+                    rows_written += len(rows)
+
+        try:
+            # a failure on either side cancels the other, so neither a broken fetch
+            # nor a failed write leaves the sibling task running
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(produce())
+                tg.create_task(consume())
+        except ExceptionGroup as eg:
+            sap_error = next((e for e in eg.exceptions if isinstance(e, SapClientException)), None)
+            raise sap_error or eg.exceptions[0]
+        finally:
+            await client.close()
+        return rows_written, fieldnames
+
+    @staticmethod
+    def _write_page(writer, rows: list[list], project) -> None:
+        if project is None:
+            writer.writerows(rows)
+        else:
+            writer.writerows(map(project, rows))
+
+    @staticmethod
+    def _merge_fieldnames(statefile_columns: list[str], columns) -> list[str]:
+        """Keeps the header order from the state file and appends newly seen columns,
+        mirroring what ElasticDictWriter used to produce."""
+        columns = list(columns)
+        if not statefile_columns or statefile_columns == columns:
+            return columns
+        known = set(statefile_columns)
+        return statefile_columns + [column for column in columns if column not in known]
+
+    @staticmethod
+    def _build_row_projector(columns, fieldnames: list[str]):
+        """Returns a callable reordering a positional row into the header order,
+        or None when the row order already matches the header."""
+        if list(columns) == fieldnames:
+            return None
+        indexes = {column: i for i, column in enumerate(columns)}
+        positions = [indexes.get(field) for field in fieldnames]
+
+        def project(row: list) -> list:
+            return [row[i] if i is not None else "" for i in positions]
+
+        return project
+
     def _init_delta(self, sync_mode: str, resource_alias: str) -> Union[bool, int, str]:
         """This method initializes delta sync by setting delta pointer to the last value from state file."""
         previous_delta_max = None
@@ -127,21 +211,21 @@ class Component(ComponentBase):
 
         return previous_delta_max
 
-    @staticmethod
-    def add_column_metadata(client: SAPClient, out_table: TableDefinition):
+    LENGTH_TYPES = frozenset(("STRING", "INTEGER", "NUMERIC"))
+
+    def add_column_metadata(self, client: SAPClient, out_table: TableDefinition):
         # TODO: How does adding metadata act when not all columns have metadata set?
+        type_map = SAP_TO_SNOWFLAKE_MAP
+        length_types = self.LENGTH_TYPES
+        add_data_type = out_table.table_metadata.add_column_data_type
+
         pks = []
-        for column in client.metadata:
-            col_md = client.metadata.get(column)
-            datatype = SAP_TO_SNOWFLAKE_MAP[col_md.get("TYPE")]
-            if datatype in ["STRING", "INTEGER", "NUMERIC"]:
-                length = str(col_md.get("LENGTH"))
-            else:
-                length = None
-            out_table.table_metadata.add_column_data_type(
+        for column, col_md in client.metadata.items():
+            datatype = type_map[col_md.get("TYPE")]
+            add_data_type(
                 column=column,
                 data_type=datatype,
-                length=length,
+                length=str(col_md.get("LENGTH")) if datatype in length_types else None,
             )
 
             if col_md.get("KEY"):
@@ -161,24 +245,6 @@ class Component(ComponentBase):
             self._configuration = SyncActionConfiguration.load_from_dict(self.configuration.parameters)
             self.validate_configuration_parameters(SyncActionConfiguration.get_dataclass_required_parameters())
 
-    @staticmethod
-    def _ensure_proper_column_names(original_dict: dict):
-        """
-        Transforms dictionary keys by removing a leading '/' character and replacing
-        other '/' characters with '_'.
-
-        Parameters:
-        - original_dict: The original dictionary with keys to transform.
-
-        Returns:
-        dict: A new dictionary with transformed keys.
-        """
-        transformed_dict = {}
-        for key, value in original_dict.items():
-            new_key = key.lstrip("/").replace("/", "_")
-            transformed_dict[new_key] = value
-        return transformed_dict
-
     @sync_action("listResources")
     def list_resources(self) -> list[SelectElement]:
         self._init_configuration(sync_act=True)
@@ -202,8 +268,14 @@ class Component(ComponentBase):
             batch_size=ConfigurationBase.DEFAULT_BATCH_SIZE,
         )
 
+        async def _list_sources():
+            try:
+                return await client.list_sources()
+            finally:
+                await client.close()
+
         try:
-            sources = asyncio.run(client.list_sources())
+            sources = asyncio.run(_list_sources())
         except SapClientException as e:
             raise UserException(f"An error occurred while fetching list of resources: {e}")
 
@@ -1,5 +1,4 @@
 import dataclasses
-import json
 from dataclasses import dataclass
 from typing import List
 
@@ -11,8 +10,17 @@ class ConfigurationBase:
     DEFAULT_BATCH_SIZE = 2
 
     @staticmethod
-    def _convert_private_value(value: str):
-        return value.replace('"#', '"pswd_')
+    def _rename_private_keys(value):
+        """Renames '#'-prefixed keys to 'pswd_' recursively, leaving values untouched."""
+        if isinstance(value, dict):
+            return {
+                ("pswd_" + key[1:] if isinstance(key, str) and key.startswith("#") else key):
+                    ConfigurationBase._rename_private_keys(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [ConfigurationBase._rename_private_keys(item) for item in value]
+        return value
 
     @staticmethod
     def _convert_private_value_inv(value: str):
@@ -31,9 +39,7 @@ class ConfigurationBase:
         Returns:
 
         """
-        json_conf = json.dumps(configuration)
-        json_conf = ConfigurationBase._convert_private_value(json_conf)
-        return dataconf.loads(json_conf, cls, ignore_unexpected=True)
+        return dataconf.dict(cls._rename_private_keys(configuration), cls, ignore_unexpected=True)
 
     @classmethod
     def get_dataclass_required_parameters(cls) -> List[str]:
@@ -1,12 +1,14 @@
 import asyncio
-import json
+import gzip
 import logging
 import os
-import uuid
-from functools import wraps
+import ssl
+import sys
+from operator import itemgetter
 from typing import Union
 
 import httpx
+import orjson
 from keboola.http_client import AsyncHttpClient
 
 from .data_source_model import DataSource
@@ -16,21 +18,20 @@ class SapClientException(Exception):
     pass
 
 
-def set_timeout(timeout):
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(self, *args, **kwargs):
-            original_timeout = self.client.timeout
-            self.client.timeout = timeout
-            try:
-                result = await func(self, *args, **kwargs)
-            finally:
-                self.client.timeout = original_timeout
-            return result
+_SOURCE_KEYS = ("SOURCE_ALIAS", "SOURCE_TEXT", "PAGING", "SOURCE_TYPE", "DELTA")
+_get_source_fields = itemgetter(*_SOURCE_KEYS)
+
+_insecure_ssl_context = None
 
-        return wrapper
 
-    return decorator
+def _get_insecure_ssl_context() -> ssl.SSLContext:
+    """One shared no-verify SSL context, so TLS state is not rebuilt per client."""
+    global _insecure_ssl_context
+    if _insecure_ssl_context is None:
+        _insecure_ssl_context = ssl.create_default_context()
+        _insecure_ssl_context.check_hostname = False
+        _insecure_ssl_context.verify_mode = ssl.CERT_NONE
+    return _insecure_ssl_context
 
 
 class SAPClient(AsyncHttpClient):
@@ -75,6 +76,24 @@ class SAPClient(AsyncHttpClient):
             verify_ssl=verify,
         )
 
+        # the base class does not expose pool limits or HTTP/2, so rebuild the underlying
+        # client; http2 is negotiated via ALPN and falls back to HTTP/1.1 transparently.
+        # The keep-alive pool is sized to the request concurrency so no page request
+        # ever queues on a connection while another sits idle.
+        pool_size = max(batch_size * 2, 8)
+        self.client = httpx.AsyncClient(
+            timeout=self.client.timeout,
+            verify=verify if verify else _get_insecure_ssl_context(),
+            headers=default_headers,
+            auth=auth,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=60,
+            ),
+            http2=True,
+        )
+
         self.destination = destination
 
         self.timeout = timeout
@@ -89,39 +108,37 @@ class SAPClient(AsyncHttpClient):
 
         if self.delta:
             logging.info(f"Delta sync is enabled, delta pointer: {self.delta}.")
-            self.delta_values.append(self.delta)
+            self.delta_values.append(self._normalize_delta_pointer(self.delta))
 
-        self.stop = False
+        self._stop = asyncio.Event()
         self.metadata = {}
+        self._queue: Union[asyncio.Queue, None] = None
+        self._spool = None
+        self._columns: Union[tuple, None] = None
 
-    @set_timeout(5)
     async def list_sources(self):
         try:
-            r = await self._get(self.DATA_SOURCES_ENDPOINT)
+            # short timeout so a dead server fails the sync action fast
+            r = await self._get(self.DATA_SOURCES_ENDPOINT, timeout=5)
         except (httpx.ConnectError, httpx.ConnectTimeout):
             raise SapClientException("Unable to list sources. Check the connection to the server.")
 
         sources = r.get("DATA_SOURCES", [])
 
         if sources:
-            sources = [
-                {
-                    "SOURCE_ALIAS": source["SOURCE_ALIAS"],
-                    "SOURCE_TEXT": source["SOURCE_TEXT"],
-                    "PAGING": source["PAGING"],
-                    "SOURCE_TYPE": source["SOURCE_TYPE"],
-                    "DELTA": source["DELTA"],
-                }
-                for source in sources
-            ]
+            sources = [dict(zip(_SOURCE_KEYS, _get_source_fields(source))) for source in sources]
 
         return sources
 
-    async def fetch(self, resource_alias: str, paging_method: str = "offset"):
+    async def fetch(self, resource_alias: str, paging_method: str = "offset", queue: asyncio.Queue = None):
+        self._queue = queue
         try:
             resource_info = await self._get_resource_metadata(resource_alias)
             data_source = DataSource.from_dict(resource_info)
-            self.metadata = data_source.metadata
+            clean = self._clean_column_name
+            self.metadata = {sys.intern(clean(column)): spec for column, spec in data_source.metadata.items()}
+            # metadata is ordered by POSITION, so the header can be derived once per fetch
+            self._columns = tuple(self.metadata)
 
             await self.check_delta_support(resource_alias, data_source)
 
@@ -137,6 +154,8 @@ class SAPClient(AsyncHttpClient):
                 )
         except SapClientException as e:
             raise SapClientException(f"Failed to load metadata for table {resource_alias}: {str(e)}")
+        finally:
+            self._close_spool()
 
     async def check_delta_support(self, resource_alias: str, data_source: DataSource):
         if self.delta and not data_source.DELTA:
@@ -159,23 +178,37 @@ class SAPClient(AsyncHttpClient):
             raise SapClientException(f"Unsupported paging method: {paging_method}")
 
     async def _fetch_paging_offset(self, resource_alias: str, page: int = 0):
-        params = {"page": page if page else 1, "limit": self.limit}
-        tasks = []
-
-        while not self.stop:
-            for _ in range(self.batch_size):
-                endpoint = self._join_url_parts(self.DATA_SOURCES_ENDPOINT, resource_alias)
-                tasks.append(self._get_and_process(endpoint, params.copy()))
-                params["page"] += 1
+        """Fetches pages with up to batch_size requests in flight.
 
-            # Wait for all tasks to complete and iterate over results.
-            results = await asyncio.gather(*tasks)
-            for result in results:
-                yield result
+        A new request is issued the moment any in-flight one finishes, so one
+        slow page does not stall the whole batch; pages are yielded as they
+        complete."""
+        endpoint = self._join_url_parts(self.DATA_SOURCES_ENDPOINT, resource_alias)
+        next_page = page if page else 1
+        pending: set[asyncio.Task] = set()
+        done: set[asyncio.Task] = set()
 
-            tasks.clear()
+        try:
+            while True:
+                while not self._stop.is_set() and len(pending) < self.batch_size:
+                    params = {"page": next_page, "limit": self.limit}
+                    pending.add(asyncio.create_task(self._get_and_process(endpoint, params)))
+                    next_page += 1
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                while done:
+                    result = done.pop().result()
+                    if result:
+                        yield result
+        finally:
+            await self._drain_tasks(pending, done)
 
     async def _fetch_paging_key(self, resource_alias: str):
+        """Fetches key blocks with up to batch_size requests in flight, refilled as
+        blocks complete, so one slow block does not stall the rest of the bucket."""
         params = {"limit": self.limit}
 
         # get blocks
@@ -185,24 +218,36 @@ class SAPClient(AsyncHttpClient):
         if not blocks:
             raise SapClientException("Unable to obtain key blocks.")  # TODO: fallback to offset paging
 
-        tasks = []
-
-        for block in blocks:
-            params = {"key_min": block.get("KEY_MIN"), "key_max": block.get("KEY_MAX")}
-            endpoint = self._join_url_parts(self.DATA_SOURCES_ENDPOINT, resource_alias)
-            tasks.append(self._get_and_process(endpoint, params.copy()))
+        endpoint = self._join_url_parts(self.DATA_SOURCES_ENDPOINT, resource_alias)
+        blocks_iter = iter(blocks)
+        pending: set[asyncio.Task] = set()
+        done: set[asyncio.Task] = set()
 
-            if len(tasks) == self.batch_size:
-                results = await asyncio.gather(*tasks)
-                for result in results:
-                    yield result
-                tasks.clear()
+        try:
+            while True:
+                while len(pending) < self.batch_size and (block := next(blocks_iter, None)) is not None:
+                    params = {"key_min": block.get("KEY_MIN"), "key_max": block.get("KEY_MAX")}
+                    pending.add(asyncio.create_task(self._get_and_process(endpoint, params)))
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                while done:
+                    result = done.pop().result()
+                    if result:
+                        yield result
+        finally:
+            await self._drain_tasks(pending, done)
 
-        # Process any remaining tasks
-        if tasks:
-            results = await asyncio.gather(*tasks)
-            for result in results:
-                yield result
+    @staticmethod
+    async def _drain_tasks(pending: set, done: set) -> None:
+        """Cancels in-flight page tasks and retrieves every leftover result, so no
+        request outlives the generator and no exception is logged as unretrieved."""
+        for task in pending:
+            task.cancel()
+        if pending or done:
+            await asyncio.gather(*pending, *done, return_exceptions=True)
 
     async def _fetch_full(self, resource_alias: str):
         """Fetches all data from resource_alias. Also takes into account delta pointer if set. In such case only fetches
@@ -217,16 +262,15 @@ class SAPClient(AsyncHttpClient):
         if entities:
             entity = entities[0]  # ONLY ONE ENTITY FOR ONE DATA SOURCE IS SUPPORTED
 
-            columns_specification = entity.get("COLUMNS")
-            columns = self._get_columns(columns_specification)
+            columns = self._columns or self._get_columns(entity.get("COLUMNS"))
 
             self._set_delta_pointer(entity)
 
             rows = entity.get("ROWS")
             if rows:
-                return self._process_result(rows, columns)
+                return columns, rows
 
-        return []
+        return None
 
     def _get_data_sources_endpoint(self, resource_alias: str):
         if self.delta:
@@ -240,15 +284,44 @@ class SAPClient(AsyncHttpClient):
 
         return params
 
-    async def _store_results(self, results: list[dict], name: str) -> None:
+    async def _store_results(self, page: Union[tuple, None], name: str) -> None:
+        """Hands a fetched page over to the consumer queue and/or the debug spool.
+
+        A page is a (columns, rows) tuple where rows are the raw positional lists
+        from the SAP response; rows are boxed into dicts only for the spool."""
+        if not page:
+            return
+
+        if self._queue is not None:
+            await self._queue.put(page)
+            if not self.debug:
+                return
+
         if not self.destination:
-            logging.warning("Destination not set, results will not be stored.")
+            if self._queue is None:
+                logging.warning("Destination not set, results will not be stored.")
             return
 
-        if results:
-            output_filename = os.path.join(self.destination, f"{name}_{uuid.uuid4()}.json")
-            with open(output_filename, "w", encoding="utf-8") as f:
-                json.dump(results, f, ensure_ascii=False, indent=4)
+        # debug spool: keep a copy of every fetched row on disk for inspection;
+        # encode and write in a worker thread so in-flight requests are not blocked
+        columns, rows = page
+        await asyncio.to_thread(self._spool_rows, self._process_result(rows, columns), name)
+
+    def _spool_rows(self, results: list[dict], name: str) -> None:
+        """Appends rows to a single gzipped NDJSON stream instead of one JSON file per page."""
+        if self._spool is None:
+            output_filename = os.path.join(self.destination, f"{name}.ndjson.gz")
+            self._spool = gzip.open(output_filename, "ab", compresslevel=1)
+
+        write = self._spool.write
+        dumps = orjson.dumps
+        for row in results:
+            write(dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+
+    def _close_spool(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
 
     async def _get_and_process(self, endpoint, params):
         """Helper method for async processing used with resources that support paging."""
@@ -258,36 +331,43 @@ class SAPClient(AsyncHttpClient):
 
         if entities:
             entity = entities[0]  # ONLY ONE ENTITY FOR ONE DATA SOURCE IS SUPPORTED
-            columns_specification = entity.get("COLUMNS")
 
             self._set_delta_pointer(entity)
 
-            columns = self._get_columns(columns_specification)
+            columns = self._columns or self._get_columns(entity.get("COLUMNS"))
             rows = entity.get("ROWS")
             if rows:
-                return self._process_result(rows, columns)
+                if "page" in params and len(rows) < params.get("limit", self.limit):
+                    # a short page is the last one; stop scheduling pages that would come back empty
+                    self._stop.set()
+                return columns, rows
             else:
-                self.stop = True
+                self._stop.set()
 
         return None
 
     def _set_delta_pointer(self, entity: dict) -> None:
         if delta_pointer := entity.get("DELTA_POINTER"):
             logging.debug(f"Delta pointer received: {delta_pointer}")
-            try:
-                delta_pointer = int(delta_pointer)
-            except ValueError:
-                try:
-                    delta_pointer = float(delta_pointer)
-                except ValueError:
-                    raise SapClientException(
-                        f"Only integer and float {delta_pointer} values are supported. "
-                        f"Delta pointer received: {delta_pointer}"
-                    )
-            self.delta_values.append(delta_pointer)
+            self.delta_values.append(self._normalize_delta_pointer(delta_pointer))
         else:
             logging.debug("No delta pointer received.")
 
+    @staticmethod
+    def _normalize_delta_pointer(value) -> Union[int, float]:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                raise SapClientException(
+                    f"Only integer and float delta pointer values are supported. "
+                    f"Delta pointer received: {value}"
+                )
+
     async def _get_resource_metadata(self, resource) -> dict:
         try:
             endpoint = f"{self.DATA_SOURCES_ENDPOINT}/{resource}/{self.METADATA_ENDPOINT}"
@@ -297,15 +377,26 @@ class SAPClient(AsyncHttpClient):
             raise SapClientException(f"Failed to fetch metadata for resource {resource}: {str(e)}")
 
     @staticmethod
-    def _process_result(rows: list[dict], columns: list):
-        return [dict(zip(columns, row)) for row in rows]
+    def _process_result(rows: list[list], columns: tuple) -> list[dict]:
+        columns = tuple(columns)
+        _dict, _zip = dict, zip  # locals keep the hot comprehension free of global lookups
+        return [_dict(_zip(columns, row)) for row in rows]
 
     @staticmethod
-    def _get_columns(columns_specification: list):
-        return [item["COLUMN_ALIAS"] for item in sorted(columns_specification, key=lambda x: x["POSITION"])]
+    def _clean_column_name(name: str) -> str:
+        """SAP aliases may contain '/' (e.g. /BIC/...), which storage column names cannot."""
+        return name.lstrip("/").replace("/", "_")
+
+    @classmethod
+    def _get_columns(cls, columns_specification: list) -> tuple:
+        clean = cls._clean_column_name
+        return tuple(
+            sys.intern(clean(item["COLUMN_ALIAS"]))
+            for item in sorted(columns_specification, key=itemgetter("POSITION"))
+        )
 
-    async def _get(self, endpoint: str, params=None):
-        """Fetches data"""
+    async def _get(self, endpoint: str, params=None, timeout=None):
+        """Fetches data. An explicit timeout overrides the client default per request."""
         if params is None:
             params = {}
 
@@ -313,8 +404,11 @@ class SAPClient(AsyncHttpClient):
             # workaround for debug logging not working properly in AsyncClient
             logging.debug(f"Fetching data from {endpoint} with params: {params}")
 
+        kwargs = {"timeout": timeout} if timeout is not None else {}
         try:
-            return await self.get(endpoint, params=params)
+            # decode from the raw bytes with orjson instead of response.json()
+            r = await self.get_raw(endpoint, params=params, **kwargs)
+            return orjson.loads(r.content)
         except (httpx.ConnectError, httpx.ConnectTimeout) as e:
             raise SapClientException(f"Failed to fetch data from endpoint {endpoint}: {str(e)}")
         except httpx.ReadTimeout as e:
@@ -327,17 +421,7 @@ class SAPClient(AsyncHttpClient):
         return "/".join(str(part).strip("/") for part in parts)
 
     @property
-    def max_delta_pointer(self) -> Union[int, str, None]:
+    def max_delta_pointer(self) -> Union[int, float, None]:
         logging.debug(f"Client Delta values: {self.delta_values}")
-        return self._max_timestamp_or_id(self.delta_values)
-
-    @staticmethod
-    def _max_timestamp_or_id(values: list):
-        if not values:
-            return None
-        # sometimes can come different length of values, so we need to normalize them
-        max_length = max(len(str(value)) for value in values)
-        normalized_data = [str(value).ljust(max_length, "0") for value in values]
-        max_normalized = max(normalized_data)
-        max_value = values[normalized_data.index(max_normalized)]
-        return max_value
+        # every stored pointer is normalized to int/float, so a plain max suffices
+        return max(self.delta_values) if self.delta_values else None
@@ -1,8 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class Column:
     POSITION: int
     COLUMN_ALIAS: str
@@ -13,7 +13,7 @@ class Column:
     KEY: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class Entity:
     ENTITY_ALIAS: str
     ENTITY_TEXT: str
@@ -22,7 +22,7 @@ class Entity:
     COLUMNS: List[Column]
 
 
-@dataclass
+@dataclass(slots=True)
 class DataSource:
     SOURCE_ALIAS: str
     SOURCE_TEXT: str
@@ -33,8 +33,8 @@ class DataSource:
 
     @classmethod
     def from_dict(cls, data: dict):
-        data_uppercase = {key.upper(): value for key, value in data.items()}
-        return cls(**data_uppercase)
+        key_map = _DATA_SOURCE_KEY_MAP
+        return cls(**{key_map.get(key) or key.upper(): value for key, value in data.items()})
 
     @staticmethod
     def _get_ordered_columns(columns_specification: Entity):
@@ -46,3 +46,7 @@ class DataSource:
     def metadata(self):
         entity: Entity = self.ENTITIES[0]
         return self._get_ordered_columns(entity)
+
+
+# case dispatch for from_dict, built once at import instead of uppercasing per call
+_DATA_SOURCE_KEY_MAP = {field.name.lower(): field.name for field in fields(DataSource)}
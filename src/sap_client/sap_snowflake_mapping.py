@@ -1,6 +1,9 @@
+from types import MappingProxyType
+
 from keboola.component.dao import SupportedDataTypes
 
-SAP_TO_SNOWFLAKE_MAP = {
+# read-only view; the mapping is shared process-wide and must never be mutated
+SAP_TO_SNOWFLAKE_MAP = MappingProxyType({
     'CHAR': SupportedDataTypes.STRING.value,
     'NUM': SupportedDataTypes.NUMERIC.value,
     'STRING': SupportedDataTypes.STRING.value,
@@ -16,4 +19,4 @@ SAP_TO_SNOWFLAKE_MAP = {
     'UTCLONG': SupportedDataTypes.TIMESTAMP.value,  # Guess, please verify
     'HEX': SupportedDataTypes.STRING.value,  # Assuming hexadecimal values are stored as strings
     'XSTRING': SupportedDataTypes.STRING.value  # Guess, please verify
-}
+})